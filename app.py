@@ -1,19 +1,77 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import plotly.express as px
+from datetime import date, datetime, timedelta
 import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import math
 import os
-from typing import List, Tuple, Dict
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Dict, NamedTuple, Optional, Union
 
 # Constants
 BASE_CAPITAL = 50000  # Initial investment amount
 DATA_PATH = 'data/'  # Path to data files
+RISK_FREE_RATE_DAILY = 0.05 / 252  # Assuming 5% annual risk-free rate
+SQRT252 = math.sqrt(252)  # Annualization factor for daily ratios
+# Strategy parameters that are only averaged for display, stored at 32-bit precision. Profit,
+# Pnl_Percentage and the Trade_<n> returns stay float64 as their values are shown as-is.
+DOWNCAST_COLUMNS = ['Index_Distance', 'Profit_booking_Morning', 'Trailing_Percaentage', 'No_of_Trades']
+# Bump whenever parse_csv changes its output, so Parquet copies written by older code are reparsed
+PARQUET_CACHE_VERSION = 2
+SELECTION_CACHE_ENTRIES = 32  # Cached results kept per function for recent filter selections
+WEEKDAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
 
-def load_data(file_path: str) -> pd.DataFrame:
+class Pre(NamedTuple):
+    """Date-sorted column arrays precomputed once per file."""
+    dates: np.ndarray  # datetime64[D]
+    profit: np.ndarray  # float64
+    pnl: np.ndarray  # float64
+    weekday: np.ndarray  # int8 codes into WEEKDAY_NAMES
+    trades: np.ndarray  # float64 No_of_Trades
+    cumprofit: np.ndarray  # float64, cumulative sum of profit (missing values as zero)
+
+def parse_csv(file_path: str) -> pd.DataFrame:
     """
-    Load and preprocess the data from the given file path.
+    Parse a strategy CSV file and preprocess its columns.
+    
+    Args:
+    file_path (str): Path to the CSV file.
+    
+    Returns:
+    pd.DataFrame: Preprocessed DataFrame, sorted by date.
+    """
+    try:
+        # The pyarrow engine parses columns in native code; fall back to the C engine
+        # if pyarrow is unavailable or rejects the file.
+        data = pd.read_csv(file_path, engine='pyarrow', parse_dates=['Date'])
+    except (ImportError, ValueError):
+        data = pd.read_csv(file_path, engine='c', parse_dates=['Date'], cache_dates=True, low_memory=False)
+    # Rows without a date cannot be placed in any window and have no weekday code
+    if data['Date'].isna().any():
+        data = data.dropna(subset=['Date']).reset_index(drop=True)
+    for col in data.columns:
+        if col in DOWNCAST_COLUMNS:
+            if data[col].dtype == np.float64:
+                data[col] = data[col].astype(np.float32)
+            elif data[col].dtype == np.int64:
+                data[col] = data[col].astype(np.int32)
+    data['weekday'] = pd.Categorical.from_codes(
+        data['Date'].dt.weekday.to_numpy(), categories=WEEKDAY_NAMES, ordered=True
+    )
+    # Downstream code relies on rows being in date order (searchsorted, cumulative sums);
+    # sorting here also keeps the Parquet copy in date order
+    if not data['Date'].is_monotonic_increasing:
+        data = data.sort_values('Date', kind='mergesort', ignore_index=True)
+    return data
+
+def load_via_parquet(file_path: str) -> pd.DataFrame:
+    """
+    Load a CSV file through its preprocessed Parquet copy, rewriting the copy first
+    if it is missing or older than the CSV. The CSV remains the source of truth.
     
     Args:
     file_path (str): Path to the CSV file.
@@ -21,99 +79,363 @@ def load_data(file_path: str) -> pd.DataFrame:
     Returns:
     pd.DataFrame: Preprocessed DataFrame.
     """
+    parquet_path = os.path.splitext(file_path)[0] + f'.v{PARQUET_CACHE_VERSION}.parquet'
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(file_path):
+        try:
+            return pd.read_parquet(parquet_path, engine='pyarrow')
+        except (OSError, ValueError, pa.ArrowException):
+            pass  # Truncated or corrupt copy; rebuild it from the CSV below
+    
+    data = parse_csv(file_path)
+    # Write under a unique temporary name and rename it into place, so readers never
+    # see a partially written copy and concurrent writers never share a file
+    tmp_path = None
     try:
-        data = pd.read_csv(file_path)
-        data['Date'] = pd.to_datetime(data['Date'], format='%Y-%m-%d')
-        data['weekday'] = data['Date'].dt.weekday.map({
-            0: 'Monday', 1: 'Tuesday', 2: 'Wednesday', 
-            3: 'Thursday', 4: 'Friday', 5: 'Saturday', 6: 'Sunday'
-        })
-        return data
-    except Exception as e:
-        st.error(f"Error loading data: {str(e)}")
-        return pd.DataFrame()
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(parquet_path), prefix=os.path.basename(parquet_path) + '.', suffix='.tmp'
+        )
+        os.close(fd)
+        data.to_parquet(tmp_path, engine='pyarrow', compression='zstd', index=False)
+        os.replace(tmp_path, parquet_path)
+    except (OSError, ValueError, pa.ArrowException):
+        # Unwritable directory or unserializable frame; the parsed CSV is still usable
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return data
+
+@st.cache_data(show_spinner=False)
+def load_data(file_path: str, mtime: float) -> pd.DataFrame:
+    """
+    Load and preprocess the data from the given file path.
+    
+    Args:
+    file_path (str): Path to the CSV file.
+    mtime (float): Modification time of the file, used to invalidate the cache.
+    
+    Returns:
+    pd.DataFrame: Preprocessed DataFrame, sorted by date.
+    
+    Raises:
+    Exception: Whatever parsing raised; failures are not cached, so the file is retried
+    on the next load.
+    """
+    data = load_via_parquet(file_path)
+    # parse_csv already sorts, but a Parquet copy may come from elsewhere; the check is cheap
+    if not data['Date'].is_monotonic_increasing:
+        data = data.sort_values('Date', kind='mergesort', ignore_index=True)
+    return data
+
+def list_data_files() -> Tuple[Tuple[str, float], ...]:
+    """
+    List the CSV files in the data directory with their modification times.
+    
+    Returns:
+    Tuple[Tuple[str, float], ...]: (file_name, mtime) pairs sorted by file name.
+    """
+    files = sorted(f for f in os.listdir(DATA_PATH) if f.endswith('.csv'))
+    return tuple((f, os.path.getmtime(os.path.join(DATA_PATH, f))) for f in files)
+
+def precompute(data: pd.DataFrame) -> Pre:
+    """
+    Extract numpy arrays from a date-sorted frame so that date filtering
+    becomes a pair of searchsorted calls and metrics work on contiguous slices.
+    
+    Args:
+    data (pd.DataFrame): DataFrame returned by load_data.
+    
+    Returns:
+    Pre: Precomputed arrays for the file.
+    """
+    if data.empty:
+        empty = np.empty(0)
+        return Pre(empty.astype('datetime64[D]'), empty, empty, empty.astype(np.int8), empty, empty)
+    
+    # load_data returns rows in date order, so the arrays line up with the frame's rows
+    profit = data['Profit'].to_numpy(dtype=np.float64)
+    return Pre(
+        dates=data['Date'].to_numpy(dtype='datetime64[D]'),
+        profit=profit,
+        pnl=data['Pnl_Percentage'].to_numpy(dtype=np.float64),
+        weekday=data['weekday'].cat.codes.to_numpy(),
+        trades=data['No_of_Trades'].to_numpy(dtype=np.float64),
+        cumprofit=np.nancumsum(profit),  # Missing days count as zero, like pandas cumsum
+    )
 
-def plot_stock_area(df: pd.DataFrame, column: str = 'Profit') -> go.Figure:
+@st.cache_resource(show_spinner=False, max_entries=1)
+def load_all(
+    file_mtimes: Tuple[Tuple[str, float], ...]
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Pre], Dict[str, str], Optional[Tuple[date, date]]]:
     """
-    Create an area plot for the given dataframe and column.
+    Load every CSV file in the data directory.
     
     Args:
-    df (pd.DataFrame): DataFrame containing the data.
-    column (str): Column name to plot (default is 'Profit').
+    file_mtimes (Tuple[Tuple[str, float], ...]): Output of list_data_files().
+    
+    Returns:
+    Tuple[Dict[str, pd.DataFrame], Dict[str, Pre], Dict[str, str], Optional[Tuple[date, date]]]:
+    Preprocessed DataFrames and their precomputed arrays, both keyed by file name
+    (empty for files that failed to load), the error message for each failed file, and
+    the earliest and latest dates across all files (None if no file has any rows).
+    """
+    def load_file(file_mtime: Tuple[str, float]) -> Tuple[pd.DataFrame, Optional[str]]:
+        try:
+            return load_data(os.path.join(DATA_PATH, file_mtime[0]), file_mtime[1]), None
+        except Exception as e:
+            return pd.DataFrame(), str(e)
+    
+    # File reads and native parsing release the GIL, so files load in parallel. Workers
+    # share the script run context so cached calls keep working in them.
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(8, len(file_mtimes))),
+        initializer=add_script_run_ctx,
+        initargs=(None, get_script_run_ctx())
+    ) as executor:
+        loaded = list(executor.map(load_file, file_mtimes))
+    
+    data_dict = {f: data for (f, _), (data, _) in zip(file_mtimes, loaded)}
+    pre_dict = {f: precompute(data) for f, data in data_dict.items()}
+    load_errors = {f: error for (f, _), (_, error) in zip(file_mtimes, loaded) if error is not None}
+    
+    # Pre dates are sorted, so each file's range is its first and last element
+    non_empty = [pre.dates for pre in pre_dict.values() if len(pre.dates)]
+    if not non_empty:
+        return data_dict, pre_dict, load_errors, None
+    date_range = (min(d[0] for d in non_empty).item(), max(d[-1] for d in non_empty).item())
+    return data_dict, pre_dict, load_errors, date_range
+
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """
+    Serialize a DataFrame to CSV with pyarrow's native writer.
+    
+    Args:
+    df (pd.DataFrame): DataFrame to export.
+    
+    Returns:
+    bytes: UTF-8 encoded CSV.
+    """
+    # Write plain dates like pandas does, unless some timestamps carry a time of day
+    date_only = 'Date' in df and (df['Date'] == df['Date'].dt.normalize()).all()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(field.type.value_type))
+        elif field.name == 'Date' and date_only:
+            table = table.set_column(i, field.name, table.column(i).cast(pa.date32()))
+    
+    buf = pa.BufferOutputStream()
+    pacsv.write_csv(table, buf)
+    return buf.getvalue().to_pybytes()
+
+@st.cache_data(show_spinner=False, max_entries=SELECTION_CACHE_ENTRIES)
+def plot_stock_area(_dates: np.ndarray, _cum: np.ndarray, column_name: str, view_key: Tuple) -> go.Figure:
+    """
+    Create an area plot of a cumulative series.
+    
+    Args:
+    _dates (np.ndarray): datetime64 dates (not hashed).
+    _cum (np.ndarray): Cumulative values aligned with _dates (not hashed).
+    column_name (str): Name of the accumulated column, used for labels.
+    view_key (Tuple): Identifies the selection the arrays were taken from; used as the cache key.
     
     Returns:
     go.Figure: Plotly figure object.
     """
-    fig = go.Figure(go.Scatter(
-        x=df.Date, 
-        y=df[column].cumsum(), 
+    # Epoch milliseconds on a date axis avoid boxing every timestamp during serialization
+    fig = go.Figure(go.Scattergl(
+        x=_dates.astype('datetime64[ms]').astype(np.int64), 
+        y=_cum, 
         fill='tozeroy', 
         mode='lines', 
         line_color='yellow'
     ))
     fig.update_layout(
         template='plotly_dark',
-        title=f"Cumulative {column} over Time",
+        title=f"Cumulative {column_name} over Time",
         xaxis_title="Date",
-        yaxis_title=f"Cumulative {column}",
+        yaxis_title=f"Cumulative {column_name}",
+        xaxis_type='date',
         margin=dict(l=0, r=0, b=0, t=40),
         plot_bgcolor='rgba(0,0,0,0)'
     )
     return fig
 
-def calculate_risk_metrics(df: pd.DataFrame) -> Tuple[float, float]:
+@st.cache_data(show_spinner=False, max_entries=SELECTION_CACHE_ENTRIES)
+def plot_returns_distribution(_pnl: np.ndarray, view_key: Tuple) -> go.Figure:
+    """
+    Create a histogram of daily returns.
+    
+    Args:
+    _pnl (np.ndarray): Daily returns in percent (not hashed).
+    view_key (Tuple): Identifies the selection _pnl was taken from; used as the cache key.
+    
+    Returns:
+    go.Figure: Plotly figure object.
+    """
+    counts, edges = np.histogram(_pnl[~np.isnan(_pnl)], bins=50)
+    centers = 0.5 * (edges[:-1] + edges[1:])
+    
+    fig = go.Figure(go.Bar(x=centers, y=counts, width=edges[1] - edges[0]))
+    fig.update_layout(
+        title="Distribution of Daily Returns (%)",
+        xaxis_title="Pnl_Percentage",
+        yaxis_title="count",
+        bargap=0
+    )
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=SELECTION_CACHE_ENTRIES)
+def plot_trade_returns(_data: pd.DataFrame, view_key: Tuple) -> Optional[go.Figure]:
+    """
+    Create a box plot of non-zero returns for each Trade_* column.
+    
+    Args:
+    _data (pd.DataFrame): Filtered DataFrame (not hashed).
+    view_key (Tuple): Identifies the selection _data was filtered with; used as the cache key.
+    
+    Returns:
+    Optional[go.Figure]: Plotly figure object, or None if there are no trade columns.
+    """
+    trade_cols = [col for col in _data.columns if col.startswith('Trade_')]
+    if not trade_cols:
+        return None
+    
+    # Column-major ravel lines up with each label repeated once per row
+    returns = _data[trade_cols].to_numpy(dtype=np.float64).ravel(order='F')
+    trades = np.repeat(trade_cols, len(_data))
+    keep = (returns != 0) & ~np.isnan(returns)  # Remove zero and missing returns
+    
+    fig = go.Figure(go.Box(x=trades[keep], y=returns[keep]))
+    fig.update_layout(title="Trade Returns by Position", xaxis_title="Trade", yaxis_title="Return")
+    return fig
+
+def calculate_risk_metrics(pnl: np.ndarray) -> Tuple[float, float]:
     """
     Calculate Sharpe Ratio and Sortino Ratio.
     
     Args:
-    df (pd.DataFrame): DataFrame containing the 'Profit' column.
+    pnl (np.ndarray): Daily returns in percent.
     
     Returns:
     Tuple[float, float]: Sharpe Ratio and Sortino Ratio.
     """
-    returns = df['Pnl_Percentage'] / 100  # Convert percentage to decimal
-    risk_free_rate = 0.05 / 252  # Assuming 5% annual risk-free rate
+    returns = pnl[~np.isnan(pnl)] * 0.01  # Skip missing days and convert percentage to decimal
     
-    excess_returns = returns - risk_free_rate
-    sharpe_ratio = excess_returns.mean() / returns.std() * np.sqrt(252)
-    sortino_ratio = excess_returns.mean() / returns[returns < 0].std() * np.sqrt(252)
+    # Sample standard deviations (ddof=1) are undefined for fewer than two values
+    if len(returns) < 2:
+        return np.nan, np.nan
+    excess_mean = returns.mean() - RISK_FREE_RATE_DAILY
+    sharpe_ratio = excess_mean / returns.std(ddof=1) * SQRT252
+    
+    # Downside deviation via where= rather than a filtered copy of the negative returns
+    negative = returns < 0
+    if np.count_nonzero(negative) > 1:
+        sortino_ratio = excess_mean / returns.std(ddof=1, where=negative) * SQRT252
+    else:
+        sortino_ratio = np.nan
     
     return sharpe_ratio, sortino_ratio
 
-def calculate_max_drawdown(data: pd.DataFrame) -> Tuple[float, float, timedelta]:
+def calculate_max_drawdown(profit: np.ndarray, dates: np.ndarray) -> Tuple[float, float, timedelta]:
     """
     Calculate the maximum drawdown, its percentage, and duration.
     
+    Works on numpy arrays to avoid the intermediate pandas Series; the duration runs
+    from the first day below the peak preceding the maximum drawdown to its trough.
+    
     Args:
-    data (pd.DataFrame): DataFrame with 'Profit' and 'Date' columns.
+    profit (np.ndarray): Daily profit values in date order.
+    dates (np.ndarray): datetime64 dates aligned with profit.
     
     Returns:
     Tuple[float, float, timedelta]: (max_drawdown, max_drawdown_percentage, max_drawdown_duration)
     """
-    cumulative_profit = data['Profit'].cumsum()
-    peak = cumulative_profit.cummax()
-    drawdown = peak - cumulative_profit
+    if len(profit) == 0:
+        return 0.0, 0.0, timedelta(0)
     
-    max_drawdown = drawdown.max()
-    max_drawdown_idx = drawdown.idxmax()
-    peak_value = peak.loc[max_drawdown_idx]
+    cumulative_profit = np.nancumsum(profit)  # Missing days count as zero, like pandas cumsum
+    drawdown = np.maximum.accumulate(cumulative_profit)
+    np.subtract(drawdown, cumulative_profit, out=drawdown)
     
-    max_drawdown_percentage = (max_drawdown / peak_value) * 100 if peak_value != 0 else 0
+    drawdown_end = int(drawdown.argmax())
+    max_drawdown = drawdown[drawdown_end]
+    peak = int(cumulative_profit[:drawdown_end + 1].argmax())
+    peak_value = cumulative_profit[peak]
+    drawdown_start = min(peak + 1, drawdown_end)  # First day below the peak
     
-    # Calculate drawdown duration
-    drawdown_start = (peak != cumulative_profit).idxmax()
-    drawdown_end = max_drawdown_idx
-    max_drawdown_duration = data.loc[drawdown_end, 'Date'] - data.loc[drawdown_start, 'Date']
+    max_drawdown_percentage = (max_drawdown / peak_value) * 100 if peak_value != 0 else 0
+    max_drawdown_duration = (dates[drawdown_end] - dates[drawdown_start]).astype('timedelta64[D]').item()
     
     return max_drawdown, max_drawdown_percentage, max_drawdown_duration
 
+def select_window(pre: Pre, lo: int, hi: int, weekday: str) -> Union[slice, np.ndarray]:
+    """
+    Select the rows of a date window, optionally restricted to one weekday.
+    
+    Args:
+    pre (Pre): Precomputed arrays for the file.
+    lo (int): First row of the date window.
+    hi (int): End (exclusive) of the date window.
+    weekday (str): Weekday name, or "All" for no weekday filter.
+    
+    Returns:
+    Union[slice, np.ndarray]: A slice for the whole window, or the row indices of the weekday within it.
+    """
+    if weekday == "All":
+        return slice(lo, hi)
+    return lo + np.flatnonzero(pre.weekday[lo:hi] == WEEKDAY_NAMES.index(weekday))
+
+@st.cache_data(show_spinner=False, max_entries=SELECTION_CACHE_ENTRIES)
+def summarize(_pre: Pre, file_key: Tuple[str, float], lo: int, hi: int, weekday: str) -> Dict[str, float]:
+    """
+    Compute all headline and risk metrics for a selection in one call.
+    
+    Args:
+    _pre (Pre): Precomputed arrays for the file (not hashed).
+    file_key (Tuple[str, float]): File name and mtime identifying _pre; part of the cache key.
+    lo (int): First row of the date window.
+    hi (int): End (exclusive) of the date window.
+    weekday (str): Weekday name, or "All" for no weekday filter.
+    
+    Returns:
+    Dict[str, float]: Metric values keyed by name.
+    """
+    window = select_window(_pre, lo, hi, weekday)
+    profit = _pre.profit[window]
+    pnl = _pre.pnl[window]
+    trades = _pre.trades[window]
+    trades = trades[~np.isnan(trades)]
+    
+    sharpe_ratio, sortino_ratio = calculate_risk_metrics(pnl)
+    max_drawdown, max_drawdown_percentage, max_drawdown_duration = calculate_max_drawdown(profit, _pre.dates[window])
+    
+    return {
+        'total_profit': np.nansum(profit),
+        'total_pnl_percentage': np.nansum(pnl),
+        'avg_trades_per_day': trades.mean() if len(trades) else np.nan,
+        'win_rate': np.count_nonzero(profit > 0) / len(profit) * 100 if len(profit) else np.nan,
+        'sharpe_ratio': sharpe_ratio,
+        'sortino_ratio': sortino_ratio,
+        'max_drawdown': max_drawdown,
+        'max_drawdown_percentage': max_drawdown_percentage,
+        'max_drawdown_days': max_drawdown_duration.days,
+    }
+
 def main():
     st.set_page_config(page_title="Algo Trading Analysis Dashboard", layout="wide")
     st.title("Algorithmic Trading Performance Analysis")
 
     # Load all CSV files
-    files = [f for f in os.listdir(DATA_PATH) if f.endswith('.csv')]
-    data_dict = {f: load_data(os.path.join(DATA_PATH, f)) for f in files}
+    file_mtimes = list_data_files()
+    data_dict, pre_dict, load_errors, date_range = load_all(file_mtimes)
+    # load_all is cached, so failures are reported here to show on every rerun
+    for f, error in load_errors.items():
+        st.error(f"Error loading data from {f}: {error}")
+    # Only offer files with rows, so a broken or empty file cannot be selected
+    files = [f for f, _ in file_mtimes if len(pre_dict[f].dates)]
+    if not files:
+        st.error(f"No strategy data could be loaded from '{DATA_PATH}'.")
+        st.stop()
+    min_date, max_date = date_range
 
     # Sidebar for user inputs
     with st.sidebar:
@@ -121,26 +443,29 @@ def main():
         selected_file = st.selectbox("Select a strategy", files)
         
         st.header("Date Range")
-        min_date = min(df['Date'].min() for df in data_dict.values())
-        max_date = max(df['Date'].max() for df in data_dict.values())
         start_date = st.date_input("Start Date", value=min_date, min_value=min_date, max_value=max_date)
         end_date = st.date_input("End Date", value=max_date, min_value=min_date, max_value=max_date)
         
         st.header("Weekday Filter")
-        weekday_options = ["All"] + ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+        weekday_options = ["All", *WEEKDAY_NAMES[:5]]
         weekday = st.selectbox("Select Weekday", weekday_options)
 
-    # Filter data based on user selection
-    data = data_dict[selected_file]
-    data = data[(data['Date'].dt.date >= start_date) & (data['Date'].dt.date <= end_date)]
-    if weekday != "All":
-        data = data[data['weekday'] == weekday]
+    # Filter data based on user selection. Rows are sorted by date, so the date range maps
+    # to a contiguous slice; the weekday filter then picks indices within it.
+    pre = pre_dict[selected_file]
+    lo = int(np.searchsorted(pre.dates, np.datetime64(start_date, 'D'), side='left'))
+    hi = int(np.searchsorted(pre.dates, np.datetime64(end_date, 'D'), side='right'))
+    window = select_window(pre, lo, hi, weekday)
+    profit = pre.profit[window]
+    pnl = pre.pnl[window]
+    data = data_dict[selected_file].iloc[window]
+
+    # Identifies the current selection for the cached metric and figure builders
+    file_key = (selected_file, dict(file_mtimes)[selected_file])
+    view_key = (*file_key, lo, hi, weekday)
 
     # Calculate metrics
-    total_profit = data["Profit"].sum()
-    total_pnl_percentage = data["Pnl_Percentage"].sum()
-    avg_trades_per_day = data["No_of_Trades"].mean()
-    win_rate = (data["Profit"] > 0).mean() * 100
+    summary = summarize(pre, file_key, lo, hi, weekday)
 
     # Overall Performance Section
     st.header("Overall Performance")
@@ -149,60 +474,58 @@ def main():
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        st.metric(label="Total Profit", value=f"${total_profit:.2f}")
+        st.metric(label="Total Profit", value=f"${summary['total_profit']:.2f}")
     with col2:
-        st.metric(label="Total PNL %", value=f"{total_pnl_percentage:.2f}%")
+        st.metric(label="Total PNL %", value=f"{summary['total_pnl_percentage']:.2f}%")
     with col3:
-        st.metric(label="Avg Trades/Day", value=f"{avg_trades_per_day:.2f}")
+        st.metric(label="Avg Trades/Day", value=f"{summary['avg_trades_per_day']:.2f}")
     with col4:
-        st.metric(label="Win Rate", value=f"{win_rate:.2f}%")
+        st.metric(label="Win Rate", value=f"{summary['win_rate']:.2f}%")
 
     # Profit by Weekday
     st.subheader("Profit by Weekday")
-    weekday_profit = data.groupby('weekday')['Profit'].sum()
+    weekday_codes = pre.weekday[window]
+    weekday_profit = pd.Series(np.bincount(weekday_codes, weights=np.nan_to_num(profit), minlength=7), index=WEEKDAY_NAMES)
+    weekday_profit = weekday_profit[np.bincount(weekday_codes, minlength=7) > 0]  # Only days present in the data
     st.bar_chart(weekday_profit)
 
     # Risk Metrics Section
     st.header("Risk Metrics")
     st.markdown("---")
     
-    sharpe_ratio, sortino_ratio = calculate_risk_metrics(data)
-    max_drawdown, max_drawdown_percentage, max_drawdown_duration = calculate_max_drawdown(data)
-
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric(label="Sharpe Ratio", value=f"{sharpe_ratio:.2f}")
+        st.metric(label="Sharpe Ratio", value=f"{summary['sharpe_ratio']:.2f}")
     with col2:
-        st.metric(label="Sortino Ratio", value=f"{sortino_ratio:.2f}")
+        st.metric(label="Sortino Ratio", value=f"{summary['sortino_ratio']:.2f}")
     with col3:
-        st.metric(label="Max Drawdown", value=f"${max_drawdown:.2f} ({max_drawdown_percentage:.2f}%)")
+        st.metric(
+            label="Max Drawdown",
+            value=f"${summary['max_drawdown']:.2f} ({summary['max_drawdown_percentage']:.2f}%)"
+        )
     with col4:
-        st.metric(label="Max Drawdown Duration", value=f"{max_drawdown_duration.days} days")
+        st.metric(label="Max Drawdown Duration", value=f"{summary['max_drawdown_days']} days")
 
     # Cumulative Profit Section
     st.header("Cumulative Profit over Time")
     st.markdown("---")
     
-    cumulative_profit_plot = plot_stock_area(data)
+    if isinstance(window, slice):
+        # Rebase the precomputed running total instead of re-accumulating the window
+        cumulative_profit = pre.cumprofit[window] - (pre.cumprofit[lo - 1] if lo > 0 else 0.0)
+    else:
+        cumulative_profit = np.nancumsum(profit)
+    cumulative_profit_plot = plot_stock_area(pre.dates[window], cumulative_profit, 'Profit', view_key)
     st.plotly_chart(cumulative_profit_plot, use_container_width=True)
 
-    # Daily Returns Distribution Section
-    st.header("Distribution of Daily Returns")
-    st.markdown("---")
-    
-    fig = px.histogram(data, x="Pnl_Percentage", nbins=50, title="Distribution of Daily Returns (%)")
-    st.plotly_chart(fig, use_container_width=True)
-
-    # Trade Analysis Section
-    st.header("Trade Analysis")
-    st.markdown("---")
+    # Heavier sections below are collapsed by default; their figures are cached per selection
+    with st.expander("Distribution of Daily Returns", expanded=False):
+        st.plotly_chart(plot_returns_distribution(pnl, view_key), use_container_width=True)
 
-    trade_cols = [col for col in data.columns if col.startswith('Trade_')]
-    if trade_cols:
-        trade_data = data[trade_cols].melt(var_name='Trade', value_name='Return')
-        trade_data = trade_data[trade_data['Return'] != 0]  # Remove zero returns
-        fig = px.box(trade_data, x='Trade', y='Return', title="Trade Returns by Position")
-        st.plotly_chart(fig, use_container_width=True)
+    with st.expander("Trade Analysis", expanded=False):
+        trade_returns_plot = plot_trade_returns(data, view_key)
+        if trade_returns_plot is not None:
+            st.plotly_chart(trade_returns_plot, use_container_width=True)
 
     # Strategy Parameters Section
     st.header("Strategy Parameters")
@@ -217,17 +540,14 @@ def main():
         st.metric(label="Trailing Percentage", value=f"{data['Trailing_Percaentage'].mean():.2f}%")
 
     # Data Table Section
-    st.header("Detailed Data")
-    st.markdown("---")
-    
-    st.dataframe(data.style.set_table_styles([{'selector': 'table', 'props': [('display', 'block')]}]))
+    with st.expander("Detailed Data", expanded=False):
+        st.dataframe(data, use_container_width=True)
 
     # Export functionality
     if st.button("Export Data to CSV"):
-        csv = data.to_csv(index=False)
         st.download_button(
             label="Download CSV",
-            data=csv,
+            data=to_csv_bytes(data),
             file_name=f"{selected_file}_filtered.csv",
             mime="text/csv",
         )